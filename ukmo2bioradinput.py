@@ -12,17 +12,27 @@ name under the pulse type. By default outputs are written under
 /gws/ssde/j25a/ncas_radar/vol2/avocet/ukmo-nimrod/vol2birdinput,
 mirroring the raw input tree, then adding a day folder (from the leading
 date in the filename) and a pulse-type folder (lp/sp).
+
+Many aggregates can be converted in one invocation with --batch (a glob) or
+--batch-list (a text file listing inputs) and spread over worker processes
+with --jobs.
 """
 import argparse
+import glob
 import h5py
+import logging
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
 
 DEFAULT_RAW_ROOT = "/gws/ssde/j25a/ncas_radar/vol2/avocet/ukmo-nimrod/raw_h5_data_final"
 DEFAULT_OUT_ROOT = "/gws/ssde/j25a/ncas_radar/vol2/avocet/ukmo-nimrod/vol2birdinput"
 DATASET_RE = re.compile(r"^dataset[0-9]+$")
 
+log = logging.getLogger(__name__)
+
 
 def remove_stale_outputs(output_dir: str, prefix: str, expected_names: set):
     """
@@ -42,19 +52,18 @@ def remove_stale_outputs(output_dir: str, prefix: str, expected_names: set):
             print(f"Removed stale pvol output: {path}", file=sys.stderr)
 
 
-def copy_group_contents_to_root(src: h5py.File, group_path: str, dst: h5py.File):
+def copy_group_contents_to_root(src: h5py.File, grp: h5py.Group, dst: h5py.File):
     """
-    Copy everything under group_path into dst root, preserving attributes.
+    Copy everything under grp into dst root, preserving attributes.
     This keeps the internal structure of the pulse/time group intact while
     flattening it to the destination root.
     """
-    grp = src[group_path]
     # Preserve group-level attributes
-    for attr, val in grp.attrs.items():
-        dst.attrs[attr] = val
-    # Copy all child datasets/groups as-is into the destination root
-    for name, obj in grp.items():
-        src.copy(obj, dst, name=name)
+    dst.attrs.update(grp.attrs)
+    # Copy each top-level child with a single H5Ocopy. Raw chunks move
+    # byte-for-byte, so nothing is decompressed or round-tripped via NumPy.
+    for name in grp:
+        src.copy(grp[name], dst, name=name)
 
 
 def process_pulse_type(src: h5py.File, pulse: str, base_name: str, output_dir: str):
@@ -66,7 +75,9 @@ def process_pulse_type(src: h5py.File, pulse: str, base_name: str, output_dir: s
     if pulse not in src:
         remove_stale_outputs(output_dir, prefix, set())
         return []
-    child_keys = sorted(src[pulse].keys())
+    # Resolve the pulse group once and reuse the handle for every time slot
+    pulse_grp = src[pulse]
+    child_keys = sorted(pulse_grp.keys())
     expected_names = {f"{base_name}_{pulse}_{key}.h5" for key in child_keys}
     remove_stale_outputs(output_dir, prefix, expected_names)
     outputs = []
@@ -75,8 +86,9 @@ def process_pulse_type(src: h5py.File, pulse: str, base_name: str, output_dir: s
         out_name = f"{base_name}_{pulse}_{key}.h5"
         out_path = os.path.join(output_dir, out_name)
         os.makedirs(os.path.dirname(out_path), exist_ok=True)
-        group = src[group_path]
-        if "dataset1" not in group or not any(DATASET_RE.match(name) for name in group.keys()):
+        group = pulse_grp[key]
+        member_names = set(group.keys())
+        if "dataset1" not in member_names or not any(DATASET_RE.match(name) for name in member_names):
             if os.path.exists(out_path):
                 os.unlink(out_path)
             print(
@@ -88,9 +100,10 @@ def process_pulse_type(src: h5py.File, pulse: str, base_name: str, output_dir: s
             os.path.dirname(out_path),
             f".{os.path.basename(out_path)}.{os.getpid()}.tmp",
         )
+        log.debug("Copying %s to %s", group_path, out_path)
         try:
             with h5py.File(tmp_path, "w") as dst:
-                copy_group_contents_to_root(src, group_path, dst)
+                copy_group_contents_to_root(src, group, dst)
                 dst.flush()
             with open(tmp_path, "rb") as handle:
                 os.fsync(handle.fileno())
@@ -105,45 +118,209 @@ def process_pulse_type(src: h5py.File, pulse: str, base_name: str, output_dir: s
     return outputs
 
 
+def derive_output_dir(input_file: str, raw_root: str, output_root: str) -> str:
+    """
+    Mirror the input path under output_root and append the day folder taken
+    from the leading YYYYMMDD of the filename.
+    """
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    abs_in = os.path.abspath(input_file)
+    abs_raw_root = os.path.abspath(raw_root)
+    try:
+        if os.path.commonpath([abs_in, abs_raw_root]) == abs_raw_root:
+            rel_parent = os.path.relpath(os.path.dirname(abs_in), abs_raw_root)
+        else:
+            rel_parent = ""
+    except ValueError:
+        rel_parent = ""
+    # Derive day folder from leading digits of filename (expected YYYYMMDD prefix)
+    day = base_name.split("_")[0]
+    return os.path.join(os.path.abspath(output_root), rel_parent, day)
+
+
+def convert_file(input_file: str, output_dir: Optional[str], raw_root: str, output_root: str):
+    """
+    Split one aggregated file into per pulse/time outputs and return the
+    written paths. output_dir overrides the derived output directory.
+    """
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    base_output_dir = output_dir or derive_output_dir(input_file, raw_root, output_root)
+    outputs = []
+    with h5py.File(input_file, "r") as src:
+        for pulse in ("lp", "sp"):
+            # Each pulse type gets its own directory and one file per time key
+            pulse_dir = os.path.join(base_output_dir, pulse)
+            outputs.extend(process_pulse_type(src, pulse, base_name, pulse_dir))
+    return outputs
+
+
+def configure_logging(verbose: bool):
+    """
+    Set up root logging for this process. Also used as the worker initializer
+    so -v reaches spawn/forkserver workers, which do not inherit the parent's
+    logging configuration.
+    """
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s",
+    )
+
+
+def expand_batch(pattern: str):
+    """
+    Expand --batch into input paths. An existing path is taken as a single
+    input whatever its content; anything else is a glob pattern.
+    """
+    if os.path.exists(pattern):
+        return [pattern]
+    return sorted(glob.glob(pattern))
+
+
+def read_batch_list(list_file: str):
+    """
+    Read --batch-list: one input path per line, blank lines and # comments
+    ignored.
+    """
+    with open(list_file) as handle:
+        return [
+            line.strip()
+            for line in handle
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def unique_inputs(paths):
+    """
+    Normalise input paths to absolute form and drop repeats, keeping the
+    first occurrence, so no aggregate is converted twice in one run.
+    """
+    seen = set()
+    unique = []
+    for path in paths:
+        abs_path = os.path.abspath(path)
+        if abs_path not in seen:
+            seen.add(abs_path)
+            unique.append(abs_path)
+    return unique
+
+
+def colliding_base_names(paths):
+    """
+    Return the output base names shared by more than one input. With a fixed
+    --output-dir those inputs would write (and race on) the same files.
+    """
+    counts = {}
+    for path in paths:
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        counts[base_name] = counts.get(base_name, 0) + 1
+    return sorted(name for name, count in counts.items() if count > 1)
+
+
+def run_batch(inputs, args) -> int:
+    """
+    Convert many aggregated files, fanning out over args.jobs worker
+    processes. The copy loop holds the GIL between HDF5 calls, so processes
+    rather than threads give the speed-up. Returns the exit status.
+    """
+    status = 0
+    existing = []
+    for path in inputs:
+        if os.path.exists(path):
+            existing.append(path)
+        else:
+            print(f"Input file does not exist: {path}", file=sys.stderr)
+            status = 1
+
+    n_written = 0
+
+    def handle(path, get_outputs):
+        nonlocal status, n_written
+        try:
+            outputs = get_outputs()
+        except Exception as exc:
+            print(f"Failed to convert {path}: {exc}", file=sys.stderr)
+            status = 1
+            return
+        if not outputs:
+            print(f"No lp/sp groups found in {path}; nothing written.", file=sys.stderr)
+        for out_path in outputs:
+            print(f"Wrote: {out_path}")
+        n_written += len(outputs)
+
+    convert_args = (args.output_dir, args.raw_root, args.output_root)
+    if args.jobs is None or args.jobs == 1:
+        for path in existing:
+            handle(path, lambda: convert_file(path, *convert_args))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=configure_logging,
+            initargs=(args.verbose,),
+        ) as pool:
+            futures = {pool.submit(convert_file, path, *convert_args): path for path in existing}
+            for future in as_completed(futures):
+                handle(futures[future], future.result)
+
+    if status == 0 and n_written == 0:
+        status = 2
+    return status
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Split lp/sp groups into single HDF5 files (one per child group) with contents copied to root."
     )
-    ap.add_argument("-i", "--input", required=True, help="Input aggregated HDF5 file")
+    src_args = ap.add_mutually_exclusive_group(required=True)
+    src_args.add_argument("-i", "--input", help="Input aggregated HDF5 file")
+    src_args.add_argument("--batch", metavar="GLOB", help="Convert every aggregated HDF5 file matching a glob pattern")
+    src_args.add_argument(
+        "--batch-list",
+        metavar="FILE",
+        help="Convert the aggregated HDF5 files listed in FILE (one path per line, # comments allowed)",
+    )
+    ap.add_argument("-j", "--jobs", type=int, help="Worker processes for --batch/--batch-list (default 1)")
     ap.add_argument("-o", "--output-dir", help="Directory to write outputs (default: derived under output-root)")
     ap.add_argument("--raw-root", default=DEFAULT_RAW_ROOT, help=f"Raw tree root to mirror (default {DEFAULT_RAW_ROOT})")
     ap.add_argument("--output-root", default=DEFAULT_OUT_ROOT, help=f"Base output root (default {DEFAULT_OUT_ROOT})")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Log each pulse/time group as it is copied (debug output)")
     args = ap.parse_args()
+    batch_mode = args.batch is not None or args.batch_list is not None
+    if args.jobs is not None:
+        if not batch_mode:
+            ap.error("--jobs requires --batch or --batch-list")
+        if args.jobs < 1:
+            ap.error("--jobs must be at least 1")
+    configure_logging(args.verbose)
+
+    if batch_mode:
+        if args.batch is not None:
+            inputs = expand_batch(args.batch)
+            if not inputs:
+                print(f"No inputs matched --batch {args.batch}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            try:
+                inputs = read_batch_list(args.batch_list)
+            except (OSError, UnicodeDecodeError) as exc:
+                ap.error(f"cannot read --batch-list file {args.batch_list}: {exc}")
+            if not inputs:
+                print(f"No inputs listed in --batch-list {args.batch_list}", file=sys.stderr)
+                sys.exit(1)
+        inputs = unique_inputs(inputs)
+        if args.output_dir:
+            collisions = colliding_base_names(inputs)
+            if collisions:
+                ap.error(
+                    "inputs share output names under --output-dir: " + ", ".join(collisions)
+                )
+        sys.exit(run_batch(inputs, args))
 
     input_file = args.input
     if not os.path.exists(input_file):
         print(f"Input file does not exist: {input_file}", file=sys.stderr)
         sys.exit(1)
 
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
-    # Derive output directory: mirror input path under output-root, append day and pulse type
-    if args.output_dir:
-        base_output_dir = args.output_dir
-    else:
-        abs_in = os.path.abspath(input_file)
-        abs_raw_root = os.path.abspath(args.raw_root)
-        try:
-            if os.path.commonpath([abs_in, abs_raw_root]) == abs_raw_root:
-                rel_parent = os.path.relpath(os.path.dirname(abs_in), abs_raw_root)
-            else:
-                rel_parent = ""
-        except ValueError:
-            rel_parent = ""
-        # Derive day folder from leading digits of filename (expected YYYYMMDD prefix)
-        day = base_name.split("_")[0]
-        base_output_dir = os.path.join(os.path.abspath(args.output_root), rel_parent, day)
-
-    outputs = []
-    with h5py.File(input_file, "r") as src:
-        for pulse in ("lp", "sp"):
-            # Each pulse type gets its own directory and one file per time key
-            pulse_dir = os.path.join(base_output_dir, pulse)
-            outputs.extend(process_pulse_type(src, pulse, base_name, pulse_dir))
+    outputs = convert_file(input_file, args.output_dir, args.raw_root, args.output_root)
 
     if not outputs:
         print("No lp/sp groups found; nothing written.", file=sys.stderr)